@@ -49,57 +49,64 @@ def main():
         vehicle_19 = env.spawn_vehicle('vehicle.audi.tt', 41)
         vehicle_20 = env.spawn_vehicle('vehicle.audi.etron', 93)
 
-        camera_1 = env.spawn_camera((0, 0, 2), vehicle=vehicle_1)
-        camera_2 = env.spawn_camera((0, 0, 2), vehicle=vehicle_2)
-        camera_3 = env.spawn_camera((0, 0, 2), vehicle=vehicle_3)
-        camera_4 = env.spawn_camera((0, 0, 2), vehicle=vehicle_4)
-        camera_5 = env.spawn_camera((0, 0, 2), vehicle=vehicle_5)
-        camera_6 = env.spawn_camera((0, 0, 2), vehicle=vehicle_6)
-        camera_7 = env.spawn_camera((0, 0, 2), vehicle=vehicle_7)
-        camera_8 = env.spawn_camera((0, 0, 2), vehicle=vehicle_8)
-        camera_9 = env.spawn_camera((0, 0, 2), vehicle=vehicle_9)
-        camera_10 = env.spawn_camera((0, 0, 2), vehicle=vehicle_10)
-        camera_11 = env.spawn_camera((0, 0, 2), vehicle=vehicle_11)
-        camera_12 = env.spawn_camera((0, 0, 2), vehicle=vehicle_12)
-        camera_13 = env.spawn_camera((0, 0, 2), vehicle=vehicle_13)
-        camera_14 = env.spawn_camera((0, 0, 2), vehicle=vehicle_14)
-        camera_15 = env.spawn_camera((0, 0, 2), vehicle=vehicle_15)
-        camera_16 = env.spawn_camera((0, 0, 2), vehicle=vehicle_16)
-        camera_17 = env.spawn_camera((0, 0, 2), vehicle=vehicle_17)
-        camera_18 = env.spawn_camera((0, 0, 2), vehicle=vehicle_18)
-        camera_19 = env.spawn_camera((0, 0, 2), vehicle=vehicle_19)
-        camera_20 = env.spawn_camera((0, 0, 2), vehicle=vehicle_20)
-        # First intersection cameras
-        camera_21 = env.spawn_camera((-62, 3, 20), (-37, 45, 0))
-        camera_22 = env.spawn_camera((-31, 37, 20), (-42, -139, 0))
-        # Second intersection cameras
-        camera_23 = env.spawn_camera((64, -1, 20), (-40, 31, 0))
-        camera_24 = env.spawn_camera((89, 39, 20), (-47, -63, 0))
+        # All cameras are spawned in a single batch, in the order of the sensor indices
+        cameras = env.spawn_cameras([
+            ((0, 0, 2), (0, 0, 0), vehicle_1),
+            ((0, 0, 2), (0, 0, 0), vehicle_2),
+            ((0, 0, 2), (0, 0, 0), vehicle_3),
+            ((0, 0, 2), (0, 0, 0), vehicle_4),
+            ((0, 0, 2), (0, 0, 0), vehicle_5),
+            ((0, 0, 2), (0, 0, 0), vehicle_6),
+            ((0, 0, 2), (0, 0, 0), vehicle_7),
+            ((0, 0, 2), (0, 0, 0), vehicle_8),
+            ((0, 0, 2), (0, 0, 0), vehicle_9),
+            ((0, 0, 2), (0, 0, 0), vehicle_10),
+            ((0, 0, 2), (0, 0, 0), vehicle_11),
+            ((0, 0, 2), (0, 0, 0), vehicle_12),
+            ((0, 0, 2), (0, 0, 0), vehicle_13),
+            ((0, 0, 2), (0, 0, 0), vehicle_14),
+            ((0, 0, 2), (0, 0, 0), vehicle_15),
+            ((0, 0, 2), (0, 0, 0), vehicle_16),
+            ((0, 0, 2), (0, 0, 0), vehicle_17),
+            ((0, 0, 2), (0, 0, 0), vehicle_18),
+            ((0, 0, 2), (0, 0, 0), vehicle_19),
+            ((0, 0, 2), (0, 0, 0), vehicle_20),
+            # First intersection cameras
+            ((-62, 3, 20), (-37, 45, 0), None),
+            ((-31, 37, 20), (-42, -139, 0), None),
+            # Second intersection cameras
+            ((64, -1, 20), (-40, 31, 0), None),
+            ((89, 39, 20), (-47, -63, 0), None)
+        ])
+        (camera_1, camera_2, camera_3, camera_4, camera_5, camera_6, camera_7, camera_8,
+         camera_9, camera_10, camera_11, camera_12, camera_13, camera_14, camera_15, camera_16,
+         camera_17, camera_18, camera_19, camera_20, camera_21, camera_22, camera_23,
+         camera_24) = cameras
 
-        camera_1.listen(lambda image: recorder.sensor_callback(image, 'camera_1'))
-        camera_2.listen(lambda image: recorder.sensor_callback(image, 'camera_2'))
-        camera_3.listen(lambda image: recorder.sensor_callback(image, 'camera_3'))
-        camera_4.listen(lambda image: recorder.sensor_callback(image, 'camera_4'))
-        camera_5.listen(lambda image: recorder.sensor_callback(image, 'camera_5'))
-        camera_6.listen(lambda image: recorder.sensor_callback(image, 'camera_6'))
-        camera_7.listen(lambda image: recorder.sensor_callback(image, 'camera_7'))
-        camera_8.listen(lambda image: recorder.sensor_callback(image, 'camera_8'))
-        camera_9.listen(lambda image: recorder.sensor_callback(image, 'camera_9'))
-        camera_10.listen(lambda image: recorder.sensor_callback(image, 'camera_10'))
-        camera_11.listen(lambda image: recorder.sensor_callback(image, 'camera_11'))
-        camera_12.listen(lambda image: recorder.sensor_callback(image, 'camera_12'))
-        camera_13.listen(lambda image: recorder.sensor_callback(image, 'camera_13'))
-        camera_14.listen(lambda image: recorder.sensor_callback(image, 'camera_14'))
-        camera_15.listen(lambda image: recorder.sensor_callback(image, 'camera_15'))
-        camera_16.listen(lambda image: recorder.sensor_callback(image, 'camera_16'))
-        camera_17.listen(lambda image: recorder.sensor_callback(image, 'camera_17'))
-        camera_18.listen(lambda image: recorder.sensor_callback(image, 'camera_18'))
-        camera_19.listen(lambda image: recorder.sensor_callback(image, 'camera_19'))
-        camera_20.listen(lambda image: recorder.sensor_callback(image, 'camera_20'))
-        camera_21.listen(lambda image: recorder.sensor_callback(image, 'camera_21'))
-        camera_22.listen(lambda image: recorder.sensor_callback(image, 'camera_22'))
-        camera_23.listen(lambda image: recorder.sensor_callback(image, 'camera_23'))
-        camera_24.listen(lambda image: recorder.sensor_callback(image, 'camera_24'))
+        camera_1.listen(lambda image: recorder.sensor_callback(image, 0))
+        camera_2.listen(lambda image: recorder.sensor_callback(image, 1))
+        camera_3.listen(lambda image: recorder.sensor_callback(image, 2))
+        camera_4.listen(lambda image: recorder.sensor_callback(image, 3))
+        camera_5.listen(lambda image: recorder.sensor_callback(image, 4))
+        camera_6.listen(lambda image: recorder.sensor_callback(image, 5))
+        camera_7.listen(lambda image: recorder.sensor_callback(image, 6))
+        camera_8.listen(lambda image: recorder.sensor_callback(image, 7))
+        camera_9.listen(lambda image: recorder.sensor_callback(image, 8))
+        camera_10.listen(lambda image: recorder.sensor_callback(image, 9))
+        camera_11.listen(lambda image: recorder.sensor_callback(image, 10))
+        camera_12.listen(lambda image: recorder.sensor_callback(image, 11))
+        camera_13.listen(lambda image: recorder.sensor_callback(image, 12))
+        camera_14.listen(lambda image: recorder.sensor_callback(image, 13))
+        camera_15.listen(lambda image: recorder.sensor_callback(image, 14))
+        camera_16.listen(lambda image: recorder.sensor_callback(image, 15))
+        camera_17.listen(lambda image: recorder.sensor_callback(image, 16))
+        camera_18.listen(lambda image: recorder.sensor_callback(image, 17))
+        camera_19.listen(lambda image: recorder.sensor_callback(image, 18))
+        camera_20.listen(lambda image: recorder.sensor_callback(image, 19))
+        camera_21.listen(lambda image: recorder.sensor_callback(image, 20))
+        camera_22.listen(lambda image: recorder.sensor_callback(image, 21))
+        camera_23.listen(lambda image: recorder.sensor_callback(image, 22))
+        camera_24.listen(lambda image: recorder.sensor_callback(image, 23))
 
         env.set_autopilot()
 
@@ -1,11 +1,15 @@
 """Script containing an abstraction class for creating the CARLA environment."""
-import json
 import random
-import math
+import operator
 from typing import Optional
 from datetime import datetime
+import numpy as np
+import orjson
 import carla
 
+# Placeholder coordinate for vehicles that have no route
+NO_DESTINATION = np.iinfo(np.int32).min
+
 class CarlaEnv:
     """
     Class for creating the CARLA environment. Specify the camera resolution, fps
@@ -14,19 +18,23 @@ class CarlaEnv:
     def __init__(self, host: str, port: int, img_width: int, img_height: int, n_frames: int,
                  fps: int):
         self.vehicle_list = []
+        self._vehicle_index = {}
+        self.vehicle_names = []
         self.sensor_list = []
         self.ai_controller_list = []
         self.pedestrian_list = []
         self.intersections = []
-        self.images = {}
-        self.transforms = {}
-        self.velocities = {}
-        self.travelled_frames = {}
-        self.destination_indices = {}
-        self.reached_destination = {}
-        self.vehicle_dimensions = {}
-        self.pedestrian_dimensions = {}
-        self.congestion_statistics = {}
+        self.intersection_xy = np.zeros((0, 2))
+        self.images = []
+        self.transforms = []
+        self.velocities = []
+        self.travelled_frames = np.zeros(0, dtype=np.int64)
+        self.reached_destination = np.zeros(0, dtype=bool)
+        self.has_destination = np.zeros(0, dtype=bool)
+        self.destination_xy = np.zeros((0, 2), dtype=np.int32)
+        self.vehicle_dimensions = np.zeros((0, 3))
+        self.pedestrian_dimensions = []
+        self.congestion_statistics = np.zeros(0, dtype=np.int64)
         self.img_width = img_width
         self.img_height = img_height
         self.n_frames = n_frames
@@ -36,8 +44,13 @@ class CarlaEnv:
         self.original_settings = self.world.get_settings()
         self.traffic_manager = self.client.get_trafficmanager()
         self.blueprint_library = self.world.get_blueprint_library()
+        self._walker_bps = list(self.blueprint_library.filter('walker.*'))
+        self._vehicle_bps = list(self.blueprint_library.filter('vehicle.*'))
         self.map = self.world.get_map()
         self.spawn_points = self.map.get_spawn_points()
+        self._waypoints_cache = None
+        self._spawn_locations = [spawn_point.location for spawn_point in self.spawn_points]
+        self._spawn_xy = np.array([(location.x, location.y) for location in self._spawn_locations])
         self.camera_bp = self.blueprint_library.find('sensor.camera.rgb')
         self.camera_bp.set_attribute('image_size_x', f'{self.img_width}')
         self.camera_bp.set_attribute('image_size_y', f'{self.img_height}')
@@ -60,50 +73,79 @@ class CarlaEnv:
             spawn_points.append(self.world.get_random_location_from_navigation())
         return spawn_points
 
-    def spawn_pedestrians_to_points(self, spawn_point_indices: list) -> None:
+    def spawn_actors(self, blueprints: list, transforms: list,
+                     parent_ids: Optional[list]=None) -> tuple:
         """
-        Spawn pedestrians to predefined spawn points. The spawn points can be visualized
-        using `visualize_spawn_points.py`.
+        Spawn actors using `blueprints` and `transforms` in a single batch. If `parent_ids` is
+        given, each actor is attached to the corresponding parent, unless its parent id is
+        None. Returns `(actors, errors)` in the same order as `blueprints`. Actors that could
+        not be spawned are None, and their error message from the server is in `errors`.
+        """
+        if parent_ids is None:
+            parent_ids = [None] * len(blueprints)
+        batch = []
+        for blueprint, transform, parent_id in zip(blueprints, transforms, parent_ids):
+            if parent_id is None:
+                batch.append(carla.command.SpawnActor(blueprint, transform))
+            else:
+                batch.append(carla.command.SpawnActor(blueprint, transform, parent_id))
+        responses = self.client.apply_batch_sync(batch)
+        errors = [response.error for response in responses]
+        actor_ids = [None if response.error else response.actor_id for response in responses]
+        spawned_ids = [actor_id for actor_id in actor_ids if actor_id is not None]
+        actors = {actor.id: actor for actor in self.world.get_actors(spawned_ids)}
+        return [actors.get(actor_id) for actor_id in actor_ids], errors
+
+    def destroy_actors(self, actors: list) -> None:
+        """Destroy `actors` in a single batch and wait until the server has destroyed them."""
+        self.client.apply_batch_sync([carla.command.DestroyActor(actor.id) for actor in actors])
+
+    def spawn_pedestrians_to_transforms(self, transforms: list) -> None:
+        """
+        Spawn pedestrians with random blueprints to `transforms` and attach an AI controller
+        to each of them. Pedestrians that collide with other actors are not spawned.
+        Pedestrians whose AI controller cannot be spawned are destroyed, as they could
+        not be moved.
         """
         walker_controller_bp = self.blueprint_library.find('controller.ai.walker')
-        spawn_points = self.generate_spawn_points(300)
-        for i in spawn_point_indices:
-            walker_bp = random.choice(self.blueprint_library.filter('walker.*'))
-            transform = carla.Transform(spawn_points[i])
-            pedestrian = self.world.try_spawn_actor(walker_bp, transform)
-            if pedestrian is None:
+        walker_bps = [random.choice(self._walker_bps) for _ in transforms]
+        spawned_pedestrians, _ = self.spawn_actors(walker_bps, transforms)
+        pedestrians = [pedestrian for pedestrian in spawned_pedestrians if pedestrian is not None]
+        ai_controllers, errors = self.spawn_actors([walker_controller_bp] * len(pedestrians),
+                                                   [carla.Transform()] * len(pedestrians),
+                                                   [pedestrian.id for pedestrian in pedestrians])
+        orphaned_pedestrians = []
+        for pedestrian, ai_controller, error in zip(pedestrians, ai_controllers, errors):
+            if ai_controller is None:
+                print(f'Failed to spawn AI controller for pedestrian {pedestrian.id}: {error}')
+                orphaned_pedestrians.append(pedestrian)
                 continue
             self.pedestrian_list.append(pedestrian)
-            pedestrian_id = f'pedestrian_{len(self.pedestrian_list)}'
-            self.pedestrian_dimensions[pedestrian_id] = self.process_dimensions(
-                pedestrian.bounding_box)
-            ai_controller = self.world.spawn_actor(walker_controller_bp, carla.Transform(),
-                                                   attach_to=pedestrian)
+            self.pedestrian_dimensions.append(self.process_dimensions(pedestrian.bounding_box))
             self.ai_controller_list.append(ai_controller)
+        if orphaned_pedestrians:
+            self.destroy_actors(orphaned_pedestrians)
         # Wait for the world to tick to ensure the pedestrians are spawned correctly
         self.world.tick()
 
+    def spawn_pedestrians_to_points(self, spawn_point_indices: list) -> None:
+        """
+        Spawn pedestrians to predefined spawn points. The spawn points can be visualized
+        using `visualize_spawn_points.py`.
+        """
+        spawn_points = self.generate_spawn_points(300)
+        transforms = [carla.Transform(spawn_points[i]) for i in spawn_point_indices]
+        self.spawn_pedestrians_to_transforms(transforms)
+
     def spawn_pedestrians(self, n_pedestrians: int) -> None:
         """
         Tries to spawn `n_pedestrians` randomly around the city. The number of spawned pedestrians
         might be lower than `n_pedestrians` due to collisions.
         """
-        walker_controller_bp = self.blueprint_library.find('controller.ai.walker')
+        transforms = []
         for _ in range(n_pedestrians):
-            walker_bp = random.choice(self.blueprint_library.filter('walker.*'))
-            transform = carla.Transform(self.world.get_random_location_from_navigation())
-            pedestrian = self.world.try_spawn_actor(walker_bp, transform)
-            if pedestrian is None:
-                continue
-            self.pedestrian_list.append(pedestrian)
-            pedestrian_id = f'pedestrian_{len(self.pedestrian_list)}'
-            self.pedestrian_dimensions[pedestrian_id] = self.process_dimensions(
-                pedestrian.bounding_box)
-            ai_controller = self.world.spawn_actor(walker_controller_bp, carla.Transform(),
-                                                   attach_to=pedestrian)
-            self.ai_controller_list.append(ai_controller)
-        # Wait for the world to tick to ensure the pedestrians are spawned correctly
-        self.world.tick()
+            transforms.append(carla.Transform(self.world.get_random_location_from_navigation()))
+        self.spawn_pedestrians_to_transforms(transforms)
 
     def move_pedestrians(self) -> None:
         """
@@ -133,15 +175,38 @@ class CarlaEnv:
             spawn_point = self.spawn_points[spawn_point_id]
         vehicle_bp = self.blueprint_library.find(vehicle_id)
         vehicle = self.world.spawn_actor(vehicle_bp, spawn_point)
-        self.vehicle_list.append(vehicle)
-        vehicle_id = f'vehicle_{len(self.vehicle_list)}'
-        self.transforms[vehicle_id] = []
-        self.velocities[vehicle_id] = []
-        self.vehicle_dimensions[vehicle_id] = self.process_dimensions(vehicle.bounding_box)
-        self.travelled_frames[vehicle_id] = 0
-        self.reached_destination[vehicle_id] = False
+        self.add_vehicle(vehicle)
         return vehicle
 
+    def add_vehicle(self, vehicle: object) -> None:
+        """Add a single spawned vehicle, see `add_vehicles`."""
+        self.add_vehicles([vehicle])
+
+    def add_vehicles(self, vehicles: list) -> None:
+        """
+        Add spawned vehicles to `vehicle_list` and grow the per-vehicle arrays once for all
+        of them. The arrays are indexed like `vehicle_list`, and the vehicle with index `i`
+        is called `vehicle_{i+1}` in `vehicle_names` and in the stored data.
+        """
+        n_vehicles = len(vehicles)
+        dimensions = [self.process_dimensions(vehicle.bounding_box) for vehicle in vehicles]
+        for vehicle in vehicles:
+            self._vehicle_index[vehicle.id] = len(self.vehicle_list)
+            self.vehicle_list.append(vehicle)
+            self.vehicle_names.append(f'vehicle_{len(self.vehicle_list)}')
+            self.transforms.append([])
+            self.velocities.append([])
+        self.vehicle_dimensions = np.concatenate(
+            (self.vehicle_dimensions, np.reshape(dimensions, (n_vehicles, 3))))
+        self.travelled_frames = np.concatenate(
+            (self.travelled_frames, np.zeros(n_vehicles, dtype=np.int64)))
+        self.reached_destination = np.concatenate(
+            (self.reached_destination, np.zeros(n_vehicles, dtype=bool)))
+        self.has_destination = np.concatenate(
+            (self.has_destination, np.zeros(n_vehicles, dtype=bool)))
+        self.destination_xy = np.concatenate(
+            (self.destination_xy, np.full((n_vehicles, 2), NO_DESTINATION, dtype=np.int32)))
+
     def add_intersection(self, x_coord: int, y_coord: int, z_coord: int=0) -> object:
         """
         Add an intersection to a predefined location. The coordinates for creating the intersection
@@ -149,63 +214,86 @@ class CarlaEnv:
         """
         intersection = carla.Location(x_coord, y_coord, z_coord)
         self.intersections.append(intersection)
-        intersection_id = f'intersection_{len(self.intersections)}'
-        self.congestion_statistics[intersection_id] = 0
+        self.intersection_xy = np.vstack((self.intersection_xy, (x_coord, y_coord)))
+        self.congestion_statistics = np.append(self.congestion_statistics,
+                                               np.zeros(1, dtype=np.int64))
         return intersection
 
     def increment_congestion_statistics(self, speed_limit: float=30.0) -> None:
         """Increment the number of frames that are congested."""
-        for i, intersection in enumerate(self.intersections):
-            intersection_id = f'intersection_{i+1}'
-            avg_velocity = self.get_avg_velocity(intersection)
-            if avg_velocity < 0.5 * speed_limit:
-                self.congestion_statistics[intersection_id] += 1
-
-    def is_in_intersection(self, vehicle: object, intersection: object,
-                           max_distance: int=50) -> bool:
-        """Check if a vehicle is within `max_distance` from the intersection."""
-        vehicle_location = vehicle.get_location()
-        if intersection.distance(vehicle_location) < max_distance:
-            return True
-        return False
-
-    def get_avg_velocity(self, intersection: object) -> float:
-        """Get the average velocity of the vehicles in a given intersection."""
-        velocities = 0
-        n_vehicles = 0
-        for vehicle in self.vehicle_list:
-            if self.is_in_intersection(vehicle, intersection):
-                if vehicle.get_traffic_light_state() == carla.TrafficLightState.Green:
-                    n_vehicles += 1
-                    velocity = math.hypot(vehicle.get_velocity().x, vehicle.get_velocity().y) * 3.6
-                    velocities += velocity
-        avg_velocity = velocities / n_vehicles if n_vehicles > 0 else float('inf')
-        return avg_velocity
+        snapshot = self._snapshot_vehicles()
+        avg_velocities = self._avg_velocities(self.intersection_xy, snapshot)
+        self.congestion_statistics += avg_velocities < 0.5 * speed_limit
+
+    def congestion_statistics_dict(self) -> dict:
+        """Return the number of congested frames keyed by intersection id."""
+        return {f'intersection_{i+1}': n_frames
+                for i, n_frames in enumerate(self.congestion_statistics.tolist())}
+
+    def _snapshot_vehicles(self) -> tuple:
+        """
+        Query the location and velocity of all spawned vehicles once. Returns
+        `(locations, velocities)`, which are `(n_vehicles, 2)` arrays ordered like
+        `vehicle_list`. They are read from the world snapshot of the latest tick, which is
+        fetched in a single call instead of one call per vehicle.
+        """
+        world_snapshot = self.world.get_snapshot()
+        n_vehicles = len(self.vehicle_list)
+        locations = np.zeros((n_vehicles, 2))
+        velocities = np.zeros((n_vehicles, 2))
+        for i, vehicle in enumerate(self.vehicle_list):
+            actor_snapshot = world_snapshot.find(vehicle.id)
+            location = actor_snapshot.get_transform().location
+            velocity = actor_snapshot.get_velocity()
+            locations[i] = (location.x, location.y)
+            velocities[i] = (velocity.x, velocity.y)
+        return locations, velocities
+
+    def _avg_velocities(self, intersection_xy: np.ndarray, snapshot: tuple,
+                        max_distance: int=50) -> np.ndarray:
+        """
+        Get the average velocity in km/h of the vehicles with a green light within
+        `max_distance` of each intersection in the `(n_intersections, 2)` array
+        `intersection_xy`. Intersections without such vehicles get an infinite velocity.
+        """
+        locations, velocities = snapshot
+        distances = np.hypot(locations[:, 0, None] - intersection_xy[None, :, 0],
+                             locations[:, 1, None] - intersection_xy[None, :, 1])
+        in_range = distances < max_distance
+        # The traffic light state is queried from the server, so it is only queried once
+        # for each vehicle that is close to at least one of the intersections.
+        green = carla.TrafficLightState.Green
+        is_green = np.zeros(len(locations), dtype=bool)
+        for i in np.flatnonzero(in_range.any(axis=1)):
+            is_green[i] = self.vehicle_list[i].get_traffic_light_state() == green
+        counted = in_range & is_green[:, None]
+        speeds = np.hypot(velocities[:, 0], velocities[:, 1]) * 3.6
+        velocity_sums = np.where(counted, speeds[:, None], 0).sum(axis=0)
+        n_vehicles = counted.sum(axis=0)
+        avg_velocities = np.full(len(intersection_xy), np.inf)
+        np.divide(velocity_sums, n_vehicles, out=avg_velocities, where=n_vehicles > 0)
+        return avg_velocities
+
+    def get_avg_velocity(self, intersection: object, snapshot: Optional[tuple]=None,
+                         max_distance: int=50) -> float:
+        """
+        Get the average velocity of the vehicles in a given intersection. Pass `snapshot`
+        from `_snapshot_vehicles` to reuse the vehicle states queried earlier in the tick.
+        """
+        if snapshot is None:
+            snapshot = self._snapshot_vehicles()
+        intersection_xy = np.array([(intersection.x, intersection.y)])
+        return float(self._avg_velocities(intersection_xy, snapshot, max_distance)[0])
 
     def spawn_vehicles(self, n_vehicles: int) -> None:
         """
         Tries to spawn `n_vehicles` randomly around the city. The number of spawned vehicles
         might be lower than `n_vehicles` due to collisions.
         """
-        for _ in range(n_vehicles):
-            vehicle_bp = random.choice(self.blueprint_library.filter('vehicle.*'))
-            spawn_point = random.choice(self.spawn_points)
-            vehicle = self.world.try_spawn_actor(vehicle_bp, spawn_point)
-            if vehicle is None:
-                continue
-            self.vehicle_list.append(vehicle)
-            vehicle_id = f'vehicle_{len(self.vehicle_list)}'
-            self.transforms[vehicle_id] = []
-            self.velocities[vehicle_id] = []
-            self.vehicle_dimensions[vehicle_id] = self.process_dimensions(vehicle.bounding_box)
-            self.travelled_frames[vehicle_id] = 0
-            self.reached_destination[vehicle_id] = False
-
-    def create_transform(self, location_tuple: tuple, rotation_tuple: tuple) -> object:
-        """Create CARLA transform object using `location_tuple` and `rotation_tuple`."""
-        location = carla.Location(location_tuple[0], location_tuple[1], location_tuple[2])
-        rotation = carla.Rotation(rotation_tuple[0], rotation_tuple[1], rotation_tuple[2])
-        return carla.Transform(location, rotation)
+        vehicle_bps = [random.choice(self._vehicle_bps) for _ in range(n_vehicles)]
+        spawn_points = [random.choice(self.spawn_points) for _ in range(n_vehicles)]
+        vehicles, _ = self.spawn_actors(vehicle_bps, spawn_points)
+        self.add_vehicles([vehicle for vehicle in vehicles if vehicle is not None])
 
     def spawn_camera(self, location_tuple: tuple, rotation_tuple: tuple=(0, 0, 0),
                      vehicle: Optional[object]=None) -> object:
@@ -213,13 +301,36 @@ class CarlaEnv:
         Spawn camera to a predefined location. If `vehicle` is not None, the location is
         relative to the vehicle location.
         """
-        transform = self.create_transform(location_tuple, rotation_tuple)
+        transform = carla.Transform(carla.Location(*location_tuple),
+                                    carla.Rotation(*rotation_tuple))
         camera = self.world.spawn_actor(self.camera_bp, transform, attach_to=vehicle)
         self.sensor_list.append(camera)
-        camera_id = f'camera_{len(self.sensor_list)}'
-        self.images[camera_id] = []
+        self.images.append([])
         return camera
 
+    def spawn_cameras(self, cameras: list) -> list:
+        """
+        Spawn multiple cameras in a single batch. `cameras` is a list of
+        `(location_tuple, rotation_tuple, vehicle)` tuples, which have the same meaning as
+        the arguments of `spawn_camera`. Returns the cameras in the same order. If any of
+        the cameras cannot be spawned, the spawned ones are destroyed and an error is raised.
+        """
+        transforms = []
+        parent_ids = []
+        for location_tuple, rotation_tuple, vehicle in cameras:
+            transforms.append(carla.Transform(carla.Location(*location_tuple),
+                                              carla.Rotation(*rotation_tuple)))
+            parent_ids.append(None if vehicle is None else vehicle.id)
+        spawned_cameras, errors = self.spawn_actors([self.camera_bp] * len(cameras), transforms,
+                                                    parent_ids)
+        if any(camera is None for camera in spawned_cameras):
+            self.destroy_actors([camera for camera in spawned_cameras if camera is not None])
+            failures = [f'camera {i}: {error}' for i, error in enumerate(errors) if error]
+            raise RuntimeError(f'Spawning the cameras failed ({", ".join(failures)})')
+        self.sensor_list.extend(spawned_cameras)
+        self.images.extend([] for _ in spawned_cameras)
+        return spawned_cameras
+
     def set_autopilot(self) -> None:
         """Set autopilot on for all spawned vehicles."""
         for vehicle in self.vehicle_list:
@@ -230,34 +341,30 @@ class CarlaEnv:
         Create a predefined route for `vehicle`. The `route_indices` can be found
         using `visualize_spawn_points.py`.
         """
-        vehicle_id = f'vehicle_{self.vehicle_list.index(vehicle)+1}'
-        self.destination_indices[vehicle_id] = route_indices[-1]
-        route = []
-        for i in route_indices:
-            route.append(self.spawn_points[i].location)
+        index = self._vehicle_index[vehicle.id]
+        self.destination_xy[index] = np.round(self._spawn_xy[route_indices[-1]])
+        self.has_destination[index] = True
+        route = [self._spawn_locations[i] for i in route_indices]
         self.traffic_manager.set_path(vehicle, route)
 
-    def increment_travelled_frames(self) -> None:
+    def increment_travelled_frames(self, snapshot: Optional[tuple]=None) -> None:
         """Increment the number of travelled frames for all spawned vehicles."""
-        for i, vehicle in enumerate(self.vehicle_list):
-            vehicle_id = f'vehicle_{i+1}'
-            if vehicle_id not in self.destination_indices:
-                continue
-            destination_index = self.destination_indices[vehicle_id]
-            destination = self.spawn_points[destination_index].location
-            destination_x = round(destination.x)
-            destination_y = round(destination.y)
-            vehicle_x = round(vehicle.get_location().x)
-            vehicle_y = round(vehicle.get_location().y)
-            if vehicle_x == destination_x and vehicle_y == destination_y:
-                self.reached_destination[vehicle_id] = True
-            if not self.reached_destination[vehicle_id]:
-                self.travelled_frames[vehicle_id] += 1
+        if snapshot is None:
+            snapshot = self._snapshot_vehicles()
+        locations = snapshot[0]
+        vehicle_xy = np.round(locations).astype(np.int32)
+        reached = self.has_destination & (vehicle_xy == self.destination_xy).all(axis=1)
+        self.reached_destination |= reached
+        self.travelled_frames += self.has_destination & ~self.reached_destination
+
+    def travelled_frames_dict(self) -> dict:
+        """Return the number of travelled frames keyed by vehicle id."""
+        return dict(zip(self.vehicle_names, self.travelled_frames.tolist()))
 
     def calculate_travel_times(self) -> dict:
         """Calculate the travel times for all spawned vehicles."""
         travel_times = {}
-        for vehicle_id, travelled_frames in self.travelled_frames.items():
+        for vehicle_id, travelled_frames in self.travelled_frames_dict().items():
             travel_times[vehicle_id] = travelled_frames / self.fps
         return travel_times
 
@@ -266,12 +373,11 @@ class CarlaEnv:
         vehicle_information = []
         for i, vehicle in enumerate(self.vehicle_list):
             vehicle_dict = {}
-            vehicle_id = f'vehicle_{i+1}'
-            vehicle_dict['id'] = vehicle_id
+            vehicle_dict['id'] = self.vehicle_names[i]
             vehicle_dict['model'] = vehicle.type_id
-            vehicle_dict['width'] = self.vehicle_dimensions[vehicle_id][1]
-            vehicle_dict['length'] = self.vehicle_dimensions[vehicle_id][0]
-            vehicle_dict['height'] = self.vehicle_dimensions[vehicle_id][2]
+            vehicle_dict['width'] = self.vehicle_dimensions[i, 1]
+            vehicle_dict['length'] = self.vehicle_dimensions[i, 0]
+            vehicle_dict['height'] = self.vehicle_dimensions[i, 2]
             vehicle_information.append(vehicle_dict)
         return vehicle_information
 
@@ -281,12 +387,12 @@ class CarlaEnv:
         get also the location and rotation.
         """
         sensor_information = []
-        vehicle_ids = [vehicle.id for vehicle in self.vehicle_list]
         for i, sensor in enumerate(self.sensor_list):
             sensor_dict = {}
             camera_id = f'camera_{i+1}'
             sensor_dict['id'] = camera_id
-            if sensor.parent is None:
+            parent = sensor.parent
+            if parent is None:
                 sensor_dict['parent_id'] = None
                 transform = sensor.get_transform()
                 location = {
@@ -302,9 +408,7 @@ class CarlaEnv:
                 sensor_dict['location'] = location
                 sensor_dict['rotation'] = rotation
             else:
-                index = vehicle_ids.index(sensor.parent.id)
-                parent_id = f'vehicle_{index+1}'
-                sensor_dict['parent_id'] = parent_id
+                sensor_dict['parent_id'] = self.vehicle_names[self._vehicle_index[parent.id]]
             sensor_information.append(sensor_dict)
         return sensor_information
 
@@ -315,9 +419,9 @@ class CarlaEnv:
             pedestrian_dict = {}
             pedestrian_id = f'pedestrian_{i+1}'
             pedestrian_dict['id'] = pedestrian_id
-            pedestrian_dict['width'] = self.pedestrian_dimensions[pedestrian_id][1]
-            pedestrian_dict['length'] = self.pedestrian_dimensions[pedestrian_id][0]
-            pedestrian_dict['height'] = self.pedestrian_dimensions[pedestrian_id][2]
+            pedestrian_dict['width'] = self.pedestrian_dimensions[i][1]
+            pedestrian_dict['length'] = self.pedestrian_dimensions[i][0]
+            pedestrian_dict['height'] = self.pedestrian_dimensions[i][2]
             pedestrian_information.append(pedestrian_dict)
         return pedestrian_information
 
@@ -336,18 +440,19 @@ class CarlaEnv:
             intersection_information.append(intersection_dict)
         return intersection_information
 
-    def generate_waypoints(self) -> list:
+    def generate_waypoints(self) -> np.ndarray:
         """
         Generate waypoints of the simulated world to create a visualization in
-        the discrete-event simulation.
+        the discrete-event simulation. Returns an `(n_waypoints, 2)` array of x and y.
+        The map does not change during a run, so the waypoints are generated only once.
         """
-        waypoints = []
-        waypoints_list = self.map.generate_waypoints(1.0)
-        for waypoint in waypoints_list:
-            location = waypoint.transform.location
-            waypoint_tuple = (location.x, location.y)
-            waypoints.append(waypoint_tuple)
-        return waypoints
+        if self._waypoints_cache is None:
+            waypoints_list = self.map.generate_waypoints(1.0)
+            get_location = operator.attrgetter('transform.location')
+            self._waypoints_cache = np.fromiter(
+                ((location.x, location.y) for location in map(get_location, waypoints_list)),
+                dtype=np.dtype((np.float32, 2)), count=len(waypoints_list))
+        return self._waypoints_cache
 
     def create_metadata(self) -> dict:
         """Create metadata about the CARLA environment and the simulated scenario."""
@@ -365,20 +470,18 @@ class CarlaEnv:
             'vehicles': self.get_vehicle_information(),
             'sensors': self.get_sensor_information(),
             'intersections': self.get_intersection_information(),
-            'congestion_statistics': self.congestion_statistics
+            'congestion_statistics': self.congestion_statistics_dict()
         }
-        return json.dumps(metadata)
+        return orjson.dumps(metadata, option=orjson.OPT_SERIALIZE_NUMPY).decode()
 
     def clear_actors(self) -> None:
         """Destroy all cameras, vehicles and pedestrians after simulation."""
-        for sensor in self.sensor_list:
-            sensor.destroy()
-        for vehicle in self.vehicle_list:
-            vehicle.destroy()
+        # The AI controllers have to be stopped before the pedestrians are destroyed
         for ai_controller in self.ai_controller_list:
-            ai_controller.destroy()
-        for pedestrian in self.pedestrian_list:
-            pedestrian.destroy()
+            ai_controller.stop()
+        actors = self.sensor_list + self.vehicle_list + self.ai_controller_list \
+            + self.pedestrian_list
+        self.client.apply_batch([carla.command.DestroyActor(actor.id) for actor in actors])
 
     def set_original_settings(self) -> None:
         """Set the CARLA simulator back to asynchronous mode."""
@@ -35,15 +35,17 @@ def main():
 
         env.spawn_vehicles(n_vehicles)
 
-        # First intersection cameras
-        camera_1 = env.spawn_camera((-62, 3, 20), (-37, 45, 0))
-        camera_2 = env.spawn_camera((-31, 37, 20), (-42, -139, 0))
-        # Second intersection cameras
-        # camera_1 = env.spawn_camera((64, -1, 20), (-40, 31, 0))
-        # camera_2 = env.spawn_camera((89, 39, 20), (-47, -63, 0))
+        camera_1, camera_2 = env.spawn_cameras([
+            # First intersection cameras
+            ((-62, 3, 20), (-37, 45, 0), None),
+            ((-31, 37, 20), (-42, -139, 0), None)
+            # Second intersection cameras
+            # ((64, -1, 20), (-40, 31, 0), None),
+            # ((89, 39, 20), (-47, -63, 0), None)
+        ])
 
-        camera_1.listen(lambda image: recorder.sensor_callback(image, 'camera_1'))
-        camera_2.listen(lambda image: recorder.sensor_callback(image, 'camera_2'))
+        camera_1.listen(lambda image: recorder.sensor_callback(image, 0))
+        camera_2.listen(lambda image: recorder.sensor_callback(image, 1))
 
         env.set_autopilot()
 
@@ -47,8 +47,21 @@ class DataLoader():
         """
         Returns entity camera photo at simulation step
         """
+        frame = self.read_image_bytes(agent_name, simulation_step)
+        return self.decode_image(frame)
+
+    def read_image_bytes(self, agent_name: str, simulation_step: int) -> ndarray:
+        """
+        Returns the JPEG encoded entity camera photo at simulation step
+        """
         frames = self.h5file.get(f'sensors/{agent_name}', 'r')
-        frame = frames[simulation_step]
+        return frames[simulation_step]
+
+    def decode_image(self, frame: ndarray) -> ndarray:
+        """
+        Decode a JPEG encoded camera photo. Does not access the hdf5 file,
+        so it can be called from multiple threads.
+        """
         img = Image.open(io.BytesIO(frame))
         img_data = asarray(img)
         return img_data
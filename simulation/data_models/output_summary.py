@@ -1,13 +1,18 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import json
 
 
-@dataclass
+# Detections are created for every frame of every node, so the data classes
+# use __slots__ instead of a per-instance __dict__. dataclass(slots=True)
+# needs Python 3.10, which is why the slots are listed explicitly.
+@dataclass(frozen=True)
 class DetectionData:
     """
     Data class for describing a bounding box detection
     produced by the model.
     """
+    __slots__ = ('parent_id', 'detection_id', 'type', 'xmin', 'xmax', 'ymin', 'ymax',
+                 'timestep')
     # Combination of parent and detection id at a single timestep 
     # create a unique id for searching.
     parent_id: str # Who detected the detection
@@ -20,15 +25,16 @@ class DetectionData:
     timestep: int
 
     def to_json(self):
-        return json.dumps(self, default=lambda o: o.__dict__, 
-            sort_keys=True, indent=1)
+        return json.dumps(asdict(self), sort_keys=True, indent=1)
 
 
-@dataclass
+@dataclass(frozen=True)
 class OutputSummary:
     """
     Data class for describing data sent by nodes to the processor
     """
+    __slots__ = ('node_id', 'is_rsu', 'agent_x', 'agent_y', 'direction', 'velocity',
+                 'detections', 'timestep')
     node_id: str
     is_rsu: bool
     agent_x: float # X position of agent in the world
@@ -5,6 +5,7 @@ import getopt
 import time
 import simpy
 from node import Node
+from perception import PerceptionWorker
 from processor import Processor
 from data import DataLoader
 from model import Model
@@ -68,9 +69,12 @@ def run_simulation(
         'yolo_images': []
     }
 
+    # The perception worker runs the model for all nodes as a single batch each tick.
+    perception = PerceptionWorker(env, dataloader, yolo_model, agent_ids)
+
     # Create nodes and add to simulation as processes
     for node_id in agent_ids:
-        node = Node(env, node_id, dataloader, yolo_model, data_pipe, result_storage_pipe)
+        node = Node(env, node_id, dataloader, perception, data_pipe, result_storage_pipe)
         env.process( node.run() )
 
     # Create the 'central processor' process.
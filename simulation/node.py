@@ -1,9 +1,10 @@
 from typing import List
 from typing import Tuple
-from model import Model
+from perception import PerceptionWorker
 from data_models.output_summary import OutputSummary, DetectionData
 from data_models.agent_state import EntityState
 from data import DataLoader
+import numpy as np
 from numpy import ndarray
 
 
@@ -13,59 +14,63 @@ class Node():
     Each node has the responsibility of processing the data of a single agent.
     The processed data will be then delivered to an external processing entity.
     """
+    __slots__ = ('env', 'node_id', 'dataloader', 'perception', 'data_pipe',
+                 'result_storage_pipe')
+
     def __init__(self, env: object, node_id: str, dataloader: DataLoader,
-                model: Model, data_pipe: dict, result_storage_pipe: dict):
+                perception: PerceptionWorker, data_pipe: dict, result_storage_pipe: dict):
         self.env: object = env
         self.node_id: str = node_id
         self.dataloader: DataLoader = dataloader
-        self.model: Model = model
+        self.perception: PerceptionWorker = perception
         self.data_pipe = data_pipe
         self.result_storage_pipe = result_storage_pipe
 
-    def read_data(self) -> Tuple[EntityState, ndarray] :
+    def read_data(self) -> Tuple[EntityState, ndarray, object] :
         """
-        Read data for current node at simulation tick
+        Read data for current node at simulation tick. The camera image and its
+        detections come from the perception worker, which processes all nodes at once.
         """
         agent_state = self.dataloader.read_entity_state(self.node_id, self.env.now)
-        camera_image = self.dataloader.read_images(self.node_id, self.env.now)
-        return agent_state, camera_image
+        camera_image, detections = self.perception.read(self.node_id)
+        return agent_state, camera_image, detections
 
-    def summarize_output(self, raw_output: object,
+    def summarize_output(self, detections: object,
                          im_shape, state: EntityState) -> OutputSummary:
         """
-        Convert raw model results into OutputSummary data class.
+        Convert the model detections of this node into OutputSummary data class.
         Only accept results with class car or person.
         """
-        # Remove the .pandas() to get the data as a tensor. Might boost performance
-        # Pandas offers columns xmin, ymin, xmax, ymax, confidence, class, name
-        pandas_yolo_results = raw_output.pandas().xyxy[0]
+        # Tensor columns are xmin, ymin, xmax, ymax, confidence and class index.
+        yolo_results = detections.cpu().numpy()
+        class_names = self.perception.class_names
+        classes = yolo_results[:, 5]
+        is_car = classes == self.perception.car_class
 
-        # Convert yolo detections to OutputSummary
-        # and exclude results for classes other than car and human.
-        # Note, for optimization instead of using iterrows
-        # alternative panda methods could possibly be used.
-        detections: List[OutputSummary] = []
-        for i, row in pandas_yolo_results.iterrows():
-            if row['name'] == 'car' or row['name'] == 'person':
-                # Filter out matches where the car detects itself
-                # Limit bottom of the view IF not rsu and detection is car.
-                if not state.is_rsu and row['name'] == 'car':
-                    ymin_max = im_shape[0] / 1.6
-                    ymax_max = im_shape[0] / 16
-                    if row['ymin'] > ymin_max and row['ymax'] > ymax_max:
-                        continue
+        # Exclude results for classes other than car and human.
+        keep = is_car | (classes == self.perception.person_class)
+        if not state.is_rsu:
+            # Filter out matches where the car detects itself
+            # Limit bottom of the view IF not rsu and detection is car.
+            ymin_max = im_shape[0] / 1.6
+            ymax_max = im_shape[0] / 16
+            keep &= ~(is_car & (yolo_results[:, 1] > ymin_max) & (yolo_results[:, 3] > ymax_max))
 
-                detection = DetectionData(
-                    parent_id=self.node_id,
-                    detection_id=str(i),
-                    type=row['name'],
-                    xmin=row['xmin'],
-                    xmax=row['xmax'],
-                    ymin=row['ymin'],
-                    ymax=row['ymax'],
-                    timestep=self.env.now
-                )
-                detections.append(detection)
+        # Convert the remaining yolo detections to DetectionData.
+        detection_data: List[DetectionData] = [
+            DetectionData(
+                parent_id=self.node_id,
+                detection_id=str(i),
+                type=class_names[int(class_index)],
+                xmin=xmin,
+                xmax=xmax,
+                ymin=ymin,
+                ymax=ymax,
+                timestep=self.env.now
+            )
+            for i, (xmin, ymin, xmax, ymax, _, class_index)
+            in zip(np.flatnonzero(keep), yolo_results[keep].tolist())
+        ]
 
         output = OutputSummary(
             node_id=self.node_id,
@@ -74,7 +79,7 @@ class Node():
             agent_y=state.y,
             direction=state.direction,
             velocity=state.velocity,
-            detections=detections,
+            detections=detection_data,
             timestep=self.env.now
         )
         return output
@@ -85,9 +90,8 @@ class Node():
         camera is processed and sent to a centralized computer.
         """
         while True:
-            state, image = self.read_data()
-            raw_output = self.model.forward(image)
-            output = self.summarize_output(raw_output, image.shape, state)
+            state, image, detections = self.read_data()
+            output = self.summarize_output(detections, image.shape, state)
             # Store the yolo bounding boxes. This is only needed for visualization purposes.
             self.result_storage_pipe['yolo_images'].extend(output.detections)
             # "Communicate" the output to the processir by storing it in the data_pipe.
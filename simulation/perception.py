@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from numpy import ndarray
+from data import DataLoader
+from model import Model
+
+
+class PerceptionWorker():
+    """
+    Class that runs the object detection model for all nodes in the simulated network.
+    At each simulation tick the camera images of all nodes are processed by the model
+    as a single batch, and each node then reads its own share of the results.
+    The images are decoded in parallel by `n_workers` threads.
+    """
+    def __init__(self, env: object, dataloader: DataLoader, model: Model,
+                 node_ids: List[str], n_workers: Optional[int] = None):
+        self.env = env
+        self.dataloader = dataloader
+        self.model = model
+        self.node_ids = node_ids
+        self.decode_pool = ThreadPoolExecutor(max_workers=n_workers)
+        # Simulation tick of the latest batch, and the results of that batch.
+        self.tick = None
+        self.images = {}
+        self.detections = {}
+        # Class names of the model and the ids of the classes kept by the nodes.
+        # They do not change between batches, so they are resolved only once.
+        self.class_names = {}
+        self.car_class = None
+        self.person_class = None
+
+    def run_batch(self) -> None:
+        """
+        Read the camera images of all nodes at the current simulation tick and
+        run the model once for all of them.
+        """
+        # Reading the hdf5 file is serialized by h5py, but JPEG decoding releases
+        # the GIL, so the images are decoded in parallel.
+        frames = [self.dataloader.read_image_bytes(node_id, self.env.now)
+                  for node_id in self.node_ids]
+        images = list(self.decode_pool.map(self.dataloader.decode_image, frames))
+        raw_output = self.model.forward(images)
+        if not self.class_names:
+            self.set_class_names(raw_output.names)
+        self.images = dict(zip(self.node_ids, images))
+        # Tensor of detections per image, see Node.summarize_output for the columns.
+        self.detections = dict(zip(self.node_ids, raw_output.xyxy))
+        self.tick = self.env.now
+
+    def set_class_names(self, names: object) -> None:
+        """
+        Store the class names of the model and look up the car and person class ids.
+        """
+        self.class_names = names if isinstance(names, dict) else dict(enumerate(names))
+        class_ids = {name: class_id for class_id, name in self.class_names.items()}
+        self.car_class = class_ids['car']
+        self.person_class = class_ids['person']
+
+    def read(self, node_id: str) -> Tuple[ndarray, object]:
+        """
+        Returns the camera image and the detections of a node at the current simulation
+        tick. The batch is run when the first node asks for its results during a tick,
+        so that the nodes and the processor keep their order within the tick.
+        """
+        if self.tick != self.env.now:
+            self.run_batch()
+        return self.images[node_id], self.detections[node_id]